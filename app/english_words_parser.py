@@ -1,8 +1,17 @@
-from typing import List, Dict
-import requests
-from bs4 import BeautifulSoup
-from collections import defaultdict
-from urllib.parse import urljoin, urlparse
+from typing import List, Set, Deque, Dict, Optional
+import asyncio
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import unicodedata
+import aiohttp
+from selectolax.parser import HTMLParser
+from collections import Counter, deque
+from urllib.parse import urljoin, urlparse, urlsplit
+from urllib.robotparser import RobotFileParser
 
 class EnglishWordsParser:
     """
@@ -12,24 +21,50 @@ class EnglishWordsParser:
     - initial_links (List[str]): Список начальных ссылок для парсинга.
     - output_file (str): Имя файла, в который будут сохранены результаты парсинга.
     - base_url (str): Базовый URL, извлеченный из начальных ссылок.
-    - to_parse_links (List[str]): Список ссылок для парсинга.
-    - parsed_links (List[str]): Список уже спарсенных ссылок.
-    - word_frequency (Dict[str, int]): Словарь для хранения частоты слов.
-    - current_link (str): Текущая обрабатываемая ссылка.
+    - to_parse_links (Deque[str]): Очередь ссылок для парсинга.
+    - parsed_links (Set[str]): Множество уже спарсенных ссылок.
+    - word_frequency (Counter): Счетчик для хранения частоты слов.
+    - concurrency (int): Максимальное количество одновременных запросов.
+    - cache_dir (str): Каталог для кэша страниц и их ETag между запусками.
+    - state_file (str): Файл со снимком состояния обхода для продолжения после прерывания.
     """
-    def __init__(self, initial_links: List[str], output_file: str):
+    # Слово — целый токен из ASCII-букв с необязательным суффиксом через апостроф ("it's",
+    # "isn't"): он не соседствует с другими буквами (в том числе не-ASCII), цифрами
+    # или частью слова через дефис
+    _WORD_RE = re.compile(r"(?<!\w)(?<!\w[-'])[a-z]+(?:'[a-z]+)?(?!\w)(?![-']\w)")
+    _CONTRACTION_SUFFIXES = frozenset({'s', 're', 'll', 've', 'd', 'm'})
+    _NEGATION_STEMS = {'ca': 'can', 'wo': 'will', 'sha': 'shall', 'ai': 'am'}
+    _EXT_RE = re.compile(r'\.[A-Za-z0-9]{1,5}$')
+    _MAX_PAGE_SIZE = 10 * 1024 * 1024
+    _SNAPSHOT_EVERY = 100
+    _SKIP_HREF_PREFIXES = ('mailto:', 'javascript:', 'tel:', '#')
+
+    def __init__(self, initial_links: List[str], output_file: str, concurrency: int = 10, cache_dir: Optional[str] = None):
         """
         Инициализация экземпляра класса.
 
         Параметры:
         - initial_links (List[str]): Список начальных ссылок для парсинга.
         - output_file (str): Имя файла, в который будут сохранены результаты парсинга.
+        - concurrency (int): Максимальное количество одновременных запросов.
+        - cache_dir (Optional[str]): Каталог для кэша страниц. По умолчанию рядом с output_file.
         """
         self.base_url = self.extract_base_url(initial_links[0])
-        self.to_parse_links = initial_links
-        self.parsed_links = []
+        self._base_netloc = urlparse(self.base_url).netloc
+        self.to_parse_links: Deque[str] = deque(initial_links)
+        self._queued: Set[str] = set(initial_links)
+        self.parsed_links: Set[str] = set()
         self.output_file = output_file
-        self.word_frequency: Dict[str, int] = defaultdict(int)
+        self.concurrency = concurrency
+        self.word_frequency: Counter = Counter()
+        self.cache_dir = cache_dir or f"{output_file}.cache"
+        self._etags_file = os.path.join(self.cache_dir, 'etags.json')
+        self._etags: Dict[str, str] = self._load_etags()
+        self._robots: Optional[RobotFileParser] = None
+        self.state_file = f"{output_file}.state"
+        self._in_flight: Set[str] = set()
+        self._pages_since_snapshot = 0
+        self.load_state()
 
     def extract_base_url(self, url: str) -> str:
         """
@@ -44,97 +79,294 @@ class EnglishWordsParser:
         parsed_url = urlparse(url)
         return f"{parsed_url.scheme}://{parsed_url.netloc}"
 
-    def fetch_page_content(self, url: str) -> str:
+    def load_state(self) -> None:
+        """
+        Восстановление состояния прерванного обхода из state_file, если он существует.
+        Состояние обхода другого сайта игнорируется.
+        """
+        try:
+            with open(self.state_file, 'rb') as file:
+                base_url, word_frequency, to_parse_links, parsed_links = pickle.load(file)
+        except FileNotFoundError:
+            return
+        if base_url != self.base_url:
+            print(f"Ignoring {self.state_file}: it belongs to a crawl of {base_url}")
+            return
+        self.word_frequency = word_frequency
+        self.to_parse_links = deque(to_parse_links)
+        self.parsed_links = parsed_links
+        self._queued = parsed_links | set(to_parse_links)
+        print(f"Resuming from {self.state_file}: {len(self.to_parse_links)} links to parse")
+
+    def save_state(self) -> None:
+        """
+        Сохранение снимка состояния обхода в state_file.
+        Страницы, загрузка которых еще не завершена, сохраняются как непройденные.
+        """
+        to_parse_links = list(self._in_flight) + list(self.to_parse_links)
+        parsed_links = self.parsed_links - self._in_flight
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'wb') as file:
+            pickle.dump((self.base_url, self.word_frequency, to_parse_links, parsed_links), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, self.state_file)
+
+    def _load_etags(self) -> Dict[str, str]:
+        """
+        Загрузка сохраненных ETag страниц из кэша.
+
+        Возвращает:
+        - Dict[str, str]: Словарь ETag по ссылкам.
+        """
+        try:
+            with open(self._etags_file, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_etags(self) -> None:
+        """
+        Сохранение ETag страниц в кэш.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._etags_file, 'w') as file:
+            json.dump(self._etags, file)
+
+    def _cache_path(self, url: str) -> str:
+        """
+        Путь к файлу кэша для заданной ссылки.
+
+        Параметры:
+        - url (str): Ссылка.
+
+        Возвращает:
+        - str: Путь к файлу кэша.
+        """
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + '.html')
+
+    async def load_robots(self, session: aiohttp.ClientSession) -> None:
+        """
+        Загрузка и разбор robots.txt сайта.
+        Как и в RobotFileParser.read(): при ответе 401/403 обход запрещен,
+        при остальных ответах 4xx или ошибке загрузки обход всех ссылок разрешен.
+
+        Параметры:
+        - session (aiohttp.ClientSession): HTTP-сессия.
+        """
+        self._robots = RobotFileParser(f"{self.base_url}/robots.txt")
+        lines: List[str] = []
+        try:
+            async with session.get(self._robots.url) as response:
+                if response.status in (401, 403):
+                    self._robots.disallow_all = True
+                elif 400 <= response.status < 500:
+                    self._robots.allow_all = True
+                elif response.status == 200:
+                    lines = (await response.text()).splitlines()
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            print(f"Error fetching {self._robots.url}: {e}")
+        self._robots.parse(lines)
+
+    def can_fetch(self, url: str) -> bool:
+        """
+        Проверка, разрешает ли robots.txt загрузку ссылки.
+
+        Параметры:
+        - url (str): Ссылка.
+
+        Возвращает:
+        - bool: True, если загрузка разрешена; False в противном случае.
+        """
+        return self._robots is None or self._robots.can_fetch('*', url)
+
+    async def fetch_page_content(self, session: aiohttp.ClientSession, url: str) -> str:
         """
         Получение текстового содержания страницы по заданной ссылке.
+        Если для страницы сохранен ETag, отправляется условный запрос,
+        и при ответе 304 текст берется из кэша. Страницы, не являющиеся HTML
+        или с заявленным размером больше допустимого, пропускаются без чтения тела ответа.
+        Если размер не заявлен, чтение прекращается при превышении _MAX_PAGE_SIZE.
 
         Параметры:
+        - session (aiohttp.ClientSession): HTTP-сессия, общая для всего обхода.
         - url (str): Ссылка.
 
         Возвращает:
         - str: Текстовое содержание страницы.
         """
+        cache_path = self._cache_path(url)
+        headers = {}
+        if url in self._etags and os.path.exists(cache_path):
+            headers['If-None-Match'] = self._etags[url]
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.RequestException as e:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    with open(cache_path, 'r', encoding='utf-8') as file:
+                        return file.read()
+                response.raise_for_status()
+                if 'text/html' not in response.headers.get('Content-Type', ''):
+                    return ""
+                if int(response.headers.get('Content-Length') or 0) > self._MAX_PAGE_SIZE:
+                    return ""
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    body.extend(chunk)
+                    if len(body) > self._MAX_PAGE_SIZE:
+                        return ""
+                try:
+                    text = body.decode(response.charset or 'utf-8', errors='replace')
+                except LookupError:  # Неизвестная кодировка в заголовке
+                    text = body.decode('utf-8', errors='replace')
+                etag = response.headers.get('ETag')
+                if etag:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    with open(cache_path, 'w', encoding='utf-8') as file:
+                        file.write(text)
+                    self._etags[url] = etag
+                return text
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError, OSError) as e:
             print(f"Error fetching {url}: {e}")
             return ""
 
     def collect_words_from_text(self, text: str) -> None:
         """
         Сбор слов и подсчет их частоты из переданного текста.
+        Учитываются только целые слова из ASCII-букв: "café" или "e-mail" не разбиваются
+        на фрагменты. Текст приводится к форме NFKC и нижнему регистру, сокращения
+        приводятся к основе (см. normalize_contraction), а слова интернируются,
+        чтобы одинаковые строки не дублировались в памяти.
 
         Параметры:
         - text (str): Текст.
 
         """
-        words = text.split()
-        for word in words:
-            if word.isalpha() and word.isascii():
-                self.word_frequency[word.lower()] += 1
+        text = unicodedata.normalize('NFKC', text).lower().replace('’', "'")
+        words = Counter(map(sys.intern, self._WORD_RE.findall(text)))
+        for token in [token for token in words if "'" in token]:
+            count = words.pop(token)
+            word = self.normalize_contraction(token)
+            if word:
+                words[sys.intern(word)] += count
+        self.word_frequency.update(words)
 
-    def find_links_and_add_to_parse(self, text: str) -> None:
+    def normalize_contraction(self, token: str) -> Optional[str]:
         """
-        Поиск ссылок в тексте и добавление их в список для парсинга.
+        Приведение слова с апострофом к основе.
+        Притяжательное 's и сокращения 're, 'll, 've, 'd, 'm отбрасываются ("it's" -> "it"),
+        отрицание n't отбрасывается вместе с "n" ("isn't" -> "is", "can't" -> "can").
 
         Параметры:
-        - text (str): Текст.
+        - token (str): Слово с апострофом в нижнем регистре.
+
+        Возвращает:
+        - Optional[str]: Основа слова или None, если суффикс не является сокращением.
+        """
+        stem, suffix = token.split("'", 1)
+        if suffix in self._CONTRACTION_SUFFIXES:
+            return stem
+        if suffix == 't' and stem.endswith('n') and len(stem) > 1:
+            stem = stem[:-1]
+            return self._NEGATION_STEMS.get(stem, stem)
+        return None
 
+    def find_links_and_add_to_parse(self, tree: HTMLParser, page_url: str) -> None:
         """
-        soup = BeautifulSoup(text, 'html.parser')
-        for link in soup.find_all('a', href=True):
-            absolute_url = urljoin(self.current_link, link['href'])
-            self.parse_url(absolute_url)
+        Поиск ссылок на странице и добавление их в список для парсинга.
+
+        Параметры:
+        - tree (HTMLParser): Разобранный HTML страницы.
+        - page_url (str): Ссылка на страницу, относительно которой разрешаются ссылки.
+
+        """
+        seen: Set[str] = set()
+        for link in tree.css('a[href]'):
+            href = link.attributes.get('href')
+            if not href or href in seen or href.startswith(self._SKIP_HREF_PREFIXES):
+                continue
+            seen.add(href)
+            self.parse_url(urljoin(page_url, href))
 
     def parse_url(self, url: str) -> None:
         """
         Парсинг заданной ссылки и добавление в список для парсинга.
+        Ссылки на другие сайты и на файлы (путь с расширением) пропускаются.
 
         Параметры:
         - url (str): Ссылка.
 
         """
-        parsed_url = urlparse(url)
-        if (
-            not parsed_url.path or not '.' in parsed_url.path
-        ) and url not in self.to_parse_links and url not in self.parsed_links and parsed_url.netloc == urlparse(self.base_url).netloc:
-            self.to_parse_links.append(url)
+        if url in self._queued:
+            return
+        parsed_url = urlsplit(url)
+        if parsed_url.netloc != self._base_netloc or self._EXT_RE.search(parsed_url.path):
+            return
+        self._queued.add(url)
+        self.to_parse_links.append(url)
 
-    def sort_word_frequency(self) -> None:
+    async def _process(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> None:
         """
-        Сортировка словаря с частотой слов по убыванию.
+        Загрузка и обработка одной страницы.
+
+        Параметры:
+        - session (aiohttp.ClientSession): HTTP-сессия.
+        - semaphore (asyncio.Semaphore): Ограничитель количества одновременных запросов.
+        - url (str): Ссылка.
+
         """
-        self.word_frequency = dict(sorted(self.word_frequency.items(), key=lambda item: item[1], reverse=True))
+        if self.can_fetch(url):
+            async with semaphore:
+                page_content = await self.fetch_page_content(session, url)
+
+            if page_content:
+                tree = HTMLParser(page_content)
+                self.find_links_and_add_to_parse(tree, url)
+                tree.strip_tags(['script', 'style'])
+                self.collect_words_from_text(tree.text(separator=' '))
+                print(url, len(self.word_frequency))
 
-    def parse_all_links(self) -> None:
+        self._in_flight.discard(url)
+
+        self._pages_since_snapshot += 1
+        if self._pages_since_snapshot >= self._SNAPSHOT_EVERY:
+            self._pages_since_snapshot = 0
+            self.save_state()
+
+    async def crawl(self) -> None:
         """
-        Парсинг всех ссылок в списке для парсинга.
+        Асинхронный обход всех ссылок в списке для парсинга.
+        Ссылки обрабатываются пачками, внутри пачки запросы выполняются параллельно.
+        Состояние периодически сохраняется в state_file и удаляется после завершения обхода.
         """
-        while self.to_parse_links:
-            self.current_link = self.to_parse_links.pop(0)
-            page_content = self.fetch_page_content(self.current_link)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.concurrency, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await self.load_robots(session)
+            try:
+                while self.to_parse_links:
+                    batch = [self.to_parse_links.popleft() for _ in range(len(self.to_parse_links))]
+                    self.parsed_links.update(batch)
+                    self._in_flight.update(batch)
+                    tasks = [asyncio.ensure_future(self._process(session, semaphore, url)) for url in batch]
+                    await asyncio.gather(*tasks)
+            except BaseException:
+                self.save_state()
+                raise
+            finally:
+                self._save_etags()
 
-            if page_content:
-                self.collect_words_from_text(page_content)
-                self.find_links_and_add_to_parse(page_content)
-                self.parsed_links.append(self.current_link)
-                print(self.current_link, len(self.word_frequency))
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
 
     def save_to_file(self) -> None:
         """
         Сортировка словаря по частоте слов и сохранение результатов в файл.
         """
-        self.sort_word_frequency()
-        with open(self.output_file, 'w') as file:
-            for word, frequency in self.word_frequency.items():
-                file.write(f"{word}:{frequency}\n")
+        with open(self.output_file, 'w', buffering=1 << 20) as file:
+            file.write("".join(f"{word}:{frequency}\n" for word, frequency in self.word_frequency.most_common()))
 
 # Пример использования:
 initial_links = ["https://go.dev"]
 output_file = "go_english_words.txt"
 
 parser = EnglishWordsParser(initial_links, output_file)
-parser.parse_all_links()
+asyncio.run(parser.crawl())
 parser.save_to_file()
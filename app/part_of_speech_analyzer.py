@@ -1,18 +1,55 @@
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import nltk
-from nltk import pos_tag
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from nltk.tag import PerceptronTagger
 from nltk.stem import WordNetLemmatizer
 from nltk.corpus import wordnet
 
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('averaged_perceptron_tagger')
-nltk.download('wordnet')
+_worker_lemmatize: Optional[Callable[[str], str]] = None
+_worker_tagger: Optional[PerceptronTagger] = None
+
+
+def download_nltk_data() -> None:
+    """
+    Загрузка необходимых данных NLTK.
+    Вызывается только в основном процессе, а не при импорте модуля рабочими процессами.
+    """
+    nltk.download('stopwords')
+    nltk.download('averaged_perceptron_tagger')
+    nltk.download('wordnet')
+
+
+def _init_worker() -> None:
+    """
+    Загрузка лемматизатора и модели теггера один раз в каждом рабочем процессе.
+    """
+    global _worker_lemmatize, _worker_tagger
+    _worker_lemmatize = lru_cache(maxsize=None)(WordNetLemmatizer().lemmatize)  # Кэш результатов лемматизации
+    _worker_lemmatize('words')  # Принудительная загрузка WordNet
+    _worker_tagger = PerceptronTagger()
+
+
+def _tag_chunk(words: List[str]) -> List[Tuple[str, str]]:
+    """
+    Лемматизация и определение частей речи для части слов в рабочем процессе.
+
+    Параметры:
+    - words (List[str]): Слова для обработки.
+
+    Возвращает:
+    - List[Tuple[str, str]]: Пары (исходное слово, тег части речи).
+    """
+    # Каждое слово размечается отдельно, чтобы тег не зависел от соседних слов
+    tagged = _worker_tagger.tag_sents([[_worker_lemmatize(word)] for word in words])
+    return [(word, sentence[0][1]) for word, sentence in zip(words, tagged)]
+
 
 class PartOfSpeechAnalyzer:
-    def __init__(self, file_path: str, min_frequency: int, allowed_parts_of_speech: List[str]):
+    def __init__(self, file_path: str, min_frequency: int, allowed_parts_of_speech: List[str], workers: Optional[int] = None):
         """
         Инициализация анализатора частей речи.
 
@@ -20,34 +57,101 @@ class PartOfSpeechAnalyzer:
         - file_path (str): Путь к текстовому файлу с данными о частоте слов.
         - min_frequency (int): Минимальный порог частоты для включения слов.
         - allowed_parts_of_speech (List[str]): Список разрешенных частей речи для фильтрации.
+        - workers (Optional[int]): Количество процессов для определения частей речи. По умолчанию число ядер.
         """
         self.file_path = file_path
         self.min_frequency = min_frequency
         self.allowed_parts_of_speech = allowed_parts_of_speech
+        self.workers = workers or os.cpu_count() or 1
         self.word_frequency_dict: Dict[str, int] = {}
         self.lemmatizer = WordNetLemmatizer()
+        self._lemmatize = lru_cache(maxsize=None)(self.lemmatizer.lemmatize)  # Кэш результатов лемматизации
+        self._stop_words = frozenset(stopwords.words('english'))
+        self._wn_lemmas = frozenset(wordnet.all_lemma_names())
 
-    def process_file(self) -> None:
+    def read_file(self) -> Iterator[Tuple[str, int]]:
         """
-        Обработка входного файла и заполнение словаря частоты слов.
+        Построчное чтение входного файла.
+
+        Возвращает:
+        - Iterator[Tuple[str, int]]: Пары (слово, частота) с частотой выше порога.
         """
         with open(self.file_path, 'r') as file:
             for line in file:
-                word, frequency = line.strip().split(':')
+                word, frequency = line.rstrip().split(':', 1)
                 frequency = int(frequency)
                 if frequency > self.min_frequency:
-                    words = word_tokenize(word)  # Токенизация слов в каждой строке
-                    self.word_frequency_dict[' '.join(words)] = frequency  # Сохранение токенизированного слова и его частоты
+                    yield sys.intern(word), frequency  # В каждой строке ровно одно слово
+
+    def process_file(self) -> None:
+        """
+        Обработка входного файла и заполнение словаря частоты слов.
+        """
+        self.word_frequency_dict = dict(self.read_file())
+
+    def lemmatize_stream(self, items: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, int]]:
+        """
+        Лемматизация слов в потоке пар (слово, частота).
+
+        Параметры:
+        - items (Iterable[Tuple[str, int]]): Пары (слово, частота).
+
+        Возвращает:
+        - Iterator[Tuple[str, int]]: Пары (лемма, частота).
+        """
+        return ((self._lemmatize(word), freq) for word, freq in items)
+
+    def filter_stop_words_stream(self, items: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, int]]:
+        """
+        Фильтрация стоп-слов в потоке пар (слово, частота).
+
+        Параметры:
+        - items (Iterable[Tuple[str, int]]): Пары (слово, частота).
+
+        Возвращает:
+        - Iterator[Tuple[str, int]]: Пары без стоп-слов.
+        """
+        stop_words = self._stop_words
+        return ((word, freq) for word, freq in items if word.lower() not in stop_words)
+
+    def filter_valid_english_words_stream(self, items: Iterable[Tuple[str, int]]) -> Iterator[Tuple[str, int]]:
+        """
+        Фильтрация недопустимых английских слов в потоке пар (слово, частота).
+
+        Параметры:
+        - items (Iterable[Tuple[str, int]]): Пары (слово, частота).
+
+        Возвращает:
+        - Iterator[Tuple[str, int]]: Пары только с допустимыми английскими словами.
+        """
+        lemmas = self._wn_lemmas
+        return ((word, freq) for word, freq in items if len(word) > 1 and (word in lemmas or self.is_valid_english_word(word)))
+
+    def process_file_stream(self, filter_stop_words: bool = False) -> None:
+        """
+        Чтение входного файла с фильтрацией и лемматизацией за один проход.
+        Промежуточные словари не создаются, результат материализуется один раз
+        в self.word_frequency_dict.
+
+        Параметры:
+        - filter_stop_words (bool): Удалять ли стоп-слова.
+        """
+        pipeline = self.filter_valid_english_words_stream(self.read_file())
+        if filter_stop_words:
+            pipeline = self.filter_stop_words_stream(pipeline)
+        self.word_frequency_dict = dict(self.lemmatize_stream(pipeline))
 
     def lemmatize_words(self) -> None:
         """
         Лемматизация слов в self.word_frequency_dict.
         """
-        self.word_frequency_dict = {self.lemmatizer.lemmatize(word): freq for word, freq in self.word_frequency_dict.items()}
+        self.word_frequency_dict = dict(self.lemmatize_stream(self.word_frequency_dict.items()))
 
     def is_valid_english_word(self, word: str) -> bool:
         """
         Проверка, является ли слово допустимым английским словом.
+        Сначала слово ищется среди лемм WordNet, для словоформ (например, множественного
+        числа) выполняется морфологический разбор.
 
         Параметры:
         - word (str): Слово для проверки.
@@ -55,38 +159,41 @@ class PartOfSpeechAnalyzer:
         Возвращает:
         - bool: True, если слово допустимо; False в противном случае.
         """
-        synsets = wordnet.synsets(word)
-        return len(synsets) > 0
+        return word in self._wn_lemmas or wordnet.morphy(word) is not None
 
     def filter_stop_words(self) -> None:
         """
         Фильтрация стоп-слов из self.word_frequency_dict.
         """
-        stop_words = set(stopwords.words('english'))
-        self.word_frequency_dict = {word: freq for word, freq in self.word_frequency_dict.items() if word.lower() not in stop_words}
+        self.word_frequency_dict = dict(self.filter_stop_words_stream(self.word_frequency_dict.items()))
 
     def filter_valid_english_words(self) -> None:
         """
         Фильтрация недопустимых английских слов из self.word_frequency_dict.
         """
-        self.word_frequency_dict = {word: freq for word, freq in self.word_frequency_dict.items() if len(word) > 1 and self.is_valid_english_word(word)}
+        self.word_frequency_dict = dict(self.filter_valid_english_words_stream(self.word_frequency_dict.items()))
 
     def filter_by_part_of_speech(self) -> None:
         """
         Фильтрация слов на основе разрешенных частей речи в self.word_frequency_dict.
+        Слова делятся на части, которые обрабатываются параллельно в отдельных процессах.
         """
-        filtered_words: Dict[str, int] = {}
-
-        for word, frequency in self.word_frequency_dict.items():
-            words = word_tokenize(word)
-            lemmatizer = WordNetLemmatizer()
-            lemmatized_words = [lemmatizer.lemmatize(w) for w in words]
-            pos_tags = pos_tag(lemmatized_words)
+        allowed = frozenset(self.allowed_parts_of_speech)
+        words = list(self.word_frequency_dict)
+        if not words:
+            return
+        chunk_size = -(-len(words) // self.workers)
+        chunks = [words[i:i + chunk_size] for i in range(0, len(words), chunk_size)]
 
-            if any(tag[1] in self.allowed_parts_of_speech for tag in pos_tags):
-                filtered_words[word] = frequency
+        with ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_worker) as pool:
+            tagged_chunks = list(pool.map(_tag_chunk, chunks, chunksize=1))
 
-        self.word_frequency_dict = filtered_words
+        self.word_frequency_dict = {
+            word: self.word_frequency_dict[word]
+            for tagged in tagged_chunks
+            for word, tag in tagged
+            if tag in allowed
+        }
 
     def sort_and_remove_duplicates(self) -> None:
         """
@@ -103,20 +210,20 @@ class PartOfSpeechAnalyzer:
         - output_file (str): Путь к выходному текстовому файлу.
         """
         self.sort_and_remove_duplicates()
-        with open(output_file, 'w') as file:
-            for word, frequency in self.word_frequency_dict.items():
-                file.write(f"{word}:{frequency}\n")
+        with open(output_file, 'w', buffering=1 << 20) as file:
+            file.write("".join(f"{word}:{frequency}\n" for word, frequency in self.word_frequency_dict.items()))
 
 # Пример использования класса
-file_path = 'go_english_words.txt'
-min_frequency = 1000
-allowed_parts_of_speech = ['NN', 'VB', 'IN', 'CC', 'PRP']
-output_file = 'output.txt'
-
-analyzer = PartOfSpeechAnalyzer(file_path, min_frequency, allowed_parts_of_speech)
-analyzer.process_file()
-# analyzer.filter_stop_words()
-analyzer.filter_valid_english_words()
-analyzer.lemmatize_words()
-analyzer.filter_by_part_of_speech()
-analyzer.save_to_file(output_file)
+# (под защитой __main__, так как рабочие процессы импортируют этот модуль)
+if __name__ == '__main__':
+    download_nltk_data()
+
+    file_path = 'go_english_words.txt'
+    min_frequency = 1000
+    allowed_parts_of_speech = ['NN', 'VB', 'IN', 'CC', 'PRP']
+    output_file = 'output.txt'
+
+    analyzer = PartOfSpeechAnalyzer(file_path, min_frequency, allowed_parts_of_speech)
+    analyzer.process_file_stream(filter_stop_words=False)
+    analyzer.filter_by_part_of_speech()
+    analyzer.save_to_file(output_file)
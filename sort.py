@@ -1,19 +1,41 @@
-def sort_and_save(input_filename, output_filename):
+import heapq
+import os
+import tempfile
+from itertools import islice
+
+CHUNK_SIZE = 500_000
+
+
+def sort_and_save(input_filename, output_filename, chunk_size=CHUNK_SIZE):
+    chunk_files = []
     try:
-        # Чтение строк из файла
+        # Чтение файла частями, сортировка каждой части и сохранение во временный файл
         with open(input_filename, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-
-        # Сортировка строк по алфавиту
-        sorted_lines = sorted(lines)
+            while True:
+                lines = list(islice(file, chunk_size))
+                if not lines:
+                    break
+                if not lines[-1].endswith('\n'):
+                    lines[-1] += '\n'
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False) as chunk_file:
+                    chunk_files.append(chunk_file.name)
+                    chunk_file.write("".join(sorted(lines)))
 
-        # Сохранение отсортированных строк в другой файл
-        with open(output_filename, 'w', encoding='utf-8') as output_file:
-            output_file.writelines(sorted_lines)
+        # Слияние отсортированных частей в другой файл
+        opened = [open(name, 'r', encoding='utf-8') for name in chunk_files]
+        try:
+            with open(output_filename, 'w', encoding='utf-8') as output_file:
+                output_file.writelines(heapq.merge(*opened))
+        finally:
+            for chunk_file in opened:
+                chunk_file.close()
 
         print(f'Строки из файла "{input_filename}" были отсортированы и сохранены в файл "{output_filename}".')
     except Exception as e:
         print(f'Произошла ошибка: {e}')
+    finally:
+        for name in chunk_files:
+            os.remove(name)
 
 # Пример использования функции
 sort_and_save('output.txt', 'output_sorted.txt')